@@ -0,0 +1,25 @@
+"""
+Process-wide shared component factories.
+Constructing GoogleSearcher / LLMClient builds pooled HTTP sessions and
+QueryClassifier builds its keyword-matching backend; anything that needs
+one of them should take it from here so every caller in the process
+shares the same instance instead of rebuilding that state.
+"""
+
+from functools import lru_cache
+
+from google_search import GoogleSearcher
+from llm_client import LLMClient
+from query_classifier import QueryClassifier
+
+@lru_cache(maxsize=1)
+def get_classifier() -> QueryClassifier:
+    return QueryClassifier()
+
+@lru_cache(maxsize=1)
+def get_google_searcher() -> GoogleSearcher:
+    return GoogleSearcher()
+
+@lru_cache(maxsize=1)
+def get_llm_client() -> LLMClient:
+    return LLMClient()
@@ -1,12 +1,57 @@
 
+import asyncio
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import os
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 
+from rate_limiter import TokenBucket
+from response_cache import ResponseCache
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 -- presence check only
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+# urllib3 decodes br responses through either binding; only advertise br
+# when one is importable, otherwise responses would arrive undecodable
+try:
+    import brotli  # noqa: F401 -- presence check only
+    _BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401 -- presence check only
+        _BROTLI = True
+    except ImportError:
+        _BROTLI = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
 class GoogleSearcher:
-    
+
+    # Response mask requested from the Custom Search API; constant per class
+    FIELDS_MASK = 'items(title,link,snippet),searchInformation(totalResults)'
+
+    __slots__ = (
+        'logger', 'api_key', 'cx', 'base_url', 'session', '_base_params',
+        'rate_limiter', 'daily_quota_used', 'daily_quota_limit', '_cache',
+        '_error_template'
+    )
+
     def __init__(self, api_key: str = None, cx: str = None):
         self.logger = logging.getLogger(__name__)
         
@@ -26,73 +71,169 @@ class GoogleSearcher:
             )
         
         self.base_url = "https://www.googleapis.com/customsearch/v1"
-        
-        self.last_request_time = 0
-        self.min_delay = 1.0 
+
+        # One pooled session so repeated searches reuse keep-alive sockets
+        # instead of paying a TCP + TLS handshake per request
+        self.session = requests.Session()
+        # Advertise Brotli alongside gzip when it can actually be decoded;
+        # br responses are ~20% smaller on JSON
+        self.session.headers['Accept-Encoding'] = (
+            'gzip, deflate, br' if _BROTLI else 'gzip, deflate'
+        )
+        # Exponential backoff on transient failures; urllib3 honours any
+        # Retry-After header before the next attempt. raise_on_status=False
+        # hands the final response back so the error paths below still see
+        # the status code instead of a RetryError.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+
+        # Static request parameters, built once instead of per call
+        self._base_params = {
+            'key': self.api_key,
+            'cx': self.cx,
+            'fields': self.FIELDS_MASK
+        }
+
+        # Token bucket: bursts of a few searches go straight through,
+        # sustained load settles at 1 request/second
+        self.rate_limiter = TokenBucket(rate=1.0, capacity=5)
         
         self.daily_quota_used = 0
-        self.daily_quota_limit = 100 
+        self.daily_quota_limit = 100
+
+        # Exact-hit cache: repeated queries skip the API round-trip and
+        # don't consume quota
+        self._cache = ResponseCache(maxsize=1024, ttl=3600.0)
+
+        # Static scalar shape of an error result; only answer/error vary
+        # per call. The list fields are built fresh in _create_error_result
+        # so no two error results (or the template) share a list object.
+        self._error_template = {
+            "query": "",
+            "total_results": 0
+        }
         
-        self.logger.info(f"Google Custom Search client initialized with CX: {self.cx}")
+        self.logger.info("Google Custom Search client initialized with CX: %s", self.cx)
     
     def search(self, query: str, num_results: int = 5) -> Dict[str, Any]:
- 
+
+        # Network failures are handled inside _make_api_request and response
+        # shape issues inside _process_api_response, so the success path here
+        # runs without an enclosing exception frame
+        self.logger.info("Searching Google for: %s", query)
+
+        cache_key = (self.cx, num_results, query)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self.logger.debug("Cache hit for query: %s", query)
+            return cached
+
+        if self.daily_quota_used >= self.daily_quota_limit:
+            return self._create_error_result("Daily quota exceeded")
+
+        self._respect_rate_limit()
+
+        response = self._make_api_request(query, num_results)
+
+        if not response:
+            return self._create_error_result("Failed to get search results")
+
+        result = self._process_api_response(response, query)
+
+        self.daily_quota_used += 1
+
+        # _process_api_response signals a processing failure with
+        # answer_type == "error" (no "error" key), so check both before
+        # admitting a result for the full TTL
+        if "error" not in result and result.get("answer_type") != "error":
+            self._cache.set(cache_key, result)
+
+        self.logger.info("Successfully retrieved %d results", len(result.get('urls', [])))
+        return result
+    
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def search_batch(self, queries: List[str], num_results: int = 5) -> List[Dict[str, Any]]:
+        """Run several searches concurrently on one async client.
+
+        Falls back to sequential search() calls when httpx is not installed.
+        """
+        if httpx is None:
+            return [self.search(query, num_results) for query in queries]
+
+        return asyncio.run(self._search_batch_async(queries, num_results))
+
+    async def _search_batch_async(self, queries: List[str], num_results: int) -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(5)
+
+        async with httpx.AsyncClient(http2=_HTTP2, timeout=10.0) as client:
+            async def search_one(query: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._search_async(client, query, num_results)
+
+            return list(await asyncio.gather(*(search_one(query) for query in queries)))
+
+    async def _search_async(self, client, query: str, num_results: int) -> Dict[str, Any]:
         try:
-            self.logger.info(f"Searching Google for: {query}")
-            
+            self.logger.info("Searching Google for: %s", query)
+
             if self.daily_quota_used >= self.daily_quota_limit:
                 return self._create_error_result("Daily quota exceeded")
-            
-            self._respect_rate_limit()
 
-            response = self._make_api_request(query, num_results)
-            
-            if not response:
-                return self._create_error_result("Failed to get search results")
-            
-            result = self._process_api_response(response, query)
-            
+            await self._respect_rate_limit_async()
+
+            params = {**self._base_params, 'q': query, 'num': min(num_results, 10)}
+
+            response = await client.get(self.base_url, params=params)
+            response.raise_for_status()
+
+            result = self._process_api_response(_json_loads(response.content), query)
+
             self.daily_quota_used += 1
-            
-            self.logger.info(f"Successfully retrieved {len(result.get('urls', []))} results")
+
             return result
-            
+
         except Exception as e:
-            self.logger.error(f"Error during Google search: {str(e)}")
+            self.logger.error("Error during Google search: %s", e)
             return self._create_error_result(f"Search failed: {str(e)}")
-    
+
     def _respect_rate_limit(self):
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_delay:
-            sleep_time = self.min_delay - time_since_last
-            self.logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        self.rate_limiter.acquire()
+
+    async def _respect_rate_limit_async(self):
+        await self.rate_limiter.acquire_async()
     
     def _make_api_request(self, query: str, num_results: int) -> Optional[Dict[str, Any]]:
 
         try:
             # Limit num_results to API maximum
             num_results = min(num_results, 10)
-            
-            print(self.api_key, self.cx, query, num_results)
-            print(self.base_url)
-            
-            params = {
-                'key': self.api_key,
-                'cx': self.cx,
-                'q': query,
-                'num': num_results,
-                'fields': 'items(title,link,snippet),searchInformation(totalResults)'
-            }
-            
-            response = requests.get(self.base_url, params=params, timeout=10)
+
+            self.logger.debug("Search params: cx=%s q=%r num=%d", self.cx, query, num_results)
+
+            params = {**self._base_params, 'q': query, 'num': num_results}
+
+            response = self.session.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
-            
-            return response.json()
+
+            return _json_loads(response.content)
             
         except requests.exceptions.HTTPError as http_error:
             if http_error.response.status_code == 403:
@@ -100,15 +241,15 @@ class GoogleSearcher:
             elif http_error.response.status_code == 400:
                 self.logger.error("Invalid request parameters")
             else:
-                self.logger.error(f"HTTP error: {http_error}")
+                self.logger.error("HTTP error: %s", http_error)
             return None
             
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"API request failed: {e}")
+            self.logger.error("API request failed: %s", e)
             return None
             
         except Exception as e:
-            self.logger.error(f"Unexpected error during API request: {e}")
+            self.logger.error("Unexpected error during API request: %s", e)
             return None
     
     def _process_api_response(self, api_response: Dict[str, Any], query: str) -> Dict[str, Any]:
@@ -116,31 +257,41 @@ class GoogleSearcher:
         result = {
             "query": query,
             "answer": "",
+            "results": [],
             "urls": [],
             "snippets": [],
             "titles": [],
             "total_results": 0
         }
-        
+
         try:
             search_info = api_response.get('searchInformation', {})
-            result["total_results"] = int(search_info.get('totalResults', 0))
+            # totalResults arrives as a decimal string; anything malformed
+            # just leaves the count at 0 rather than failing the response
+            try:
+                result["total_results"] = int(search_info.get('totalResults', 0))
+            except (TypeError, ValueError):
+                result["total_results"] = 0
             
             items = api_response.get('items', [])
-            
-            for item in items:
-                link = item.get('link', '')
-                if link:
-                    result["urls"].append(link)
-                
-                snippet = item.get('snippet', '')
-                if snippet:
-                    result["snippets"].append(snippet)
-                
-                title = item.get('title', '')
-                if title:
-                    result["titles"].append(title)
-            
+
+            # One aligned row per item; index i always refers to the same hit
+            rows = [
+                {
+                    "url": item.get('link', ''),
+                    "snippet": item.get('snippet', ''),
+                    "title": item.get('title', '')
+                }
+                for item in items
+            ]
+            result["results"] = rows
+
+            # Backward-compatible flat lists (empty fields skipped, so these
+            # may be shorter than `results` and are not index-aligned)
+            result["urls"] = [row['url'] for row in rows if row['url']]
+            result["snippets"] = [row['snippet'] for row in rows if row['snippet']]
+            result["titles"] = [row['title'] for row in rows if row['title']]
+
             if result["snippets"]:
                 result["answer"] = result["snippets"][0]
                 result["answer_type"] = "api_result"
@@ -148,15 +299,18 @@ class GoogleSearcher:
                 result["answer"] = f"No results found for '{query}'"
                 result["answer_type"] = "no_results"
             
-            self.logger.info(f"Processed {len(items)} results from API")
+            self.logger.info("Processed %d results from API", len(items))
             
         except Exception as e:
-            self.logger.error(f"Error processing API response: {e}")
+            self.logger.error("Error processing API response: %s", e)
             result["answer"] = f"Error processing search results: {str(e)}"
             result["answer_type"] = "error"
         
         return result
     
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
     def get_quota_info(self) -> Dict[str, Any]:
 
         return {
@@ -173,28 +327,30 @@ class GoogleSearcher:
     def _create_error_result(self, error_message: str) -> Dict[str, Any]:
 
         return {
-            "query": "",
-            "answer": f"Sorry, I couldn't search Google: {error_message}",
+            **self._error_template,
+            "results": [],
             "urls": [],
             "snippets": [],
             "titles": [],
-            "total_results": 0,
+            "answer": f"Sorry, I couldn't search Google: {error_message}",
             "error": error_message
         }
-    
-    def get_search_suggestions(self, query: str) -> List[str]:
 
-        try:
-            # Basic suggestions based on query
-            suggestions = [
-                f"{query} meaning",
-                f"{query} definition", 
-                f"what is {query}",
-                f"{query} information",
-                f"{query} facts"
-            ]
-            return suggestions[:3]
-            
-        except Exception as e:
-            self.logger.error(f"Error getting suggestions: {str(e)}")
-            return []
+    @staticmethod
+    def get_search_suggestions(query: str) -> List[str]:
+
+        # Fresh list per call so callers can mutate their copy; the cached
+        # value is an immutable tuple
+        return list(GoogleSearcher._cached_suggestions(query))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _cached_suggestions(query: str) -> tuple:
+
+        # Basic suggestions based on query; pure function of the query, so
+        # repeated calls for the same term hit the cache
+        return (
+            f"{query} meaning",
+            f"{query} definition",
+            f"what is {query}"
+        )
@@ -6,29 +6,42 @@ between Google Search and LLM tools based on query analysis.
 
 import os
 import logging
-from typing import Dict, Any, Literal, TypedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Literal, Optional, TypedDict
 from langgraph.graph import StateGraph, END
 from langchain_openai import AzureChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, HumanMessagePromptTemplate
 
+from components import get_classifier, get_google_searcher, get_llm_client
 from google_search import GoogleSearcher
 from llm_client import LLMClient
 
 class RouterState(TypedDict):
     query: str
     tool_decision: str
+    confidence: float
     result: Dict[str, Any]
     error: str
 
 class LangGraphRouter:
 
-    def __init__(self, api_key: str = None, model: str = "gpt-4o-mini", 
-                 endpoint: str = None, deployment: str = None, api_version: str = "2024-12-01-preview"):
+    def __init__(self, api_key: str = None, model: str = "gpt-4o-mini",
+                 endpoint: str = None, deployment: str = None, api_version: str = "2024-12-01-preview",
+                 speculative: bool = False, llm=None, google_searcher: GoogleSearcher = None,
+                 llm_client: LLMClient = None):
         self.logger = logging.getLogger(__name__)
+
+        # When enabled, low-confidence routing decisions run both tools in
+        # parallel and keep the better answer. Off by default because it
+        # doubles API spend on the ambiguous slice of queries.
+        self.speculative = speculative
         
-        # Initialize Azure OpenAI LLM for routing decisions
-        self.llm = AzureChatOpenAI(
+        # Initialize Azure OpenAI LLM for routing decisions; injected
+        # clients are reused as-is so callers can share pooled connections
+        # across router instances
+        self.llm = llm or AzureChatOpenAI(
             api_key=api_key or os.getenv('AZURE_OPENAI_API_KEY'),
             azure_endpoint=endpoint or os.getenv('AZURE_OPENAI_ENDPOINT'),
             azure_deployment=deployment or os.getenv('AZURE_OPENAI_DEPLOYMENT', 'gpt-4o-mini'),
@@ -36,9 +49,28 @@ class LangGraphRouter:
             temperature=0.1  # Low temperature for consistent routing decisions
         )
         
-        # Initialize tools
-        self.google_searcher = GoogleSearcher()
-        self.llm_client = LLMClient()
+        # Routing prompt is static apart from the query, so build the
+        # template once instead of re-parsing it on every routed query
+        self._routing_prompt = ChatPromptTemplate.from_messages([
+            SystemMessage(content="""You are a router agent.
+                Decide which tool should handle the user query.
+
+                • If the query asks about recent, live, or factual updates → choose google_search
+                • If the query asks for reasoning, explanations, or general knowledge → choose llm_client
+
+                Respond with only one word: 'google_tool' or 'llm_tool'"""),
+            HumanMessagePromptTemplate.from_template("{query}")
+        ])
+        self._valid_decisions = frozenset(('google_tool', 'llm_tool'))
+
+        # Local keyword classifier decides unambiguous queries without an
+        # LLM round-trip; only contested queries pay for the router call
+        self.classifier = get_classifier()
+
+        # Initialize tools; defaults come from the shared factories so
+        # multiple routers in one process reuse the same pooled clients
+        self.google_searcher = google_searcher or get_google_searcher()
+        self.llm_client = llm_client or get_llm_client()
         
         # Build the LangGraph
         self.graph = self._build_graph()
@@ -55,10 +87,11 @@ class LangGraphRouter:
         workflow.add_node("router", self._router_node)
         workflow.add_node("google_tool", self._google_tool_node)
         workflow.add_node("llm_tool", self._llm_tool_node)
-        
+        workflow.add_node("speculative", self._speculative_node)
+
         # Set entry point
         workflow.set_entry_point("router")
-        
+
         # Add conditional edges from router
         workflow.add_conditional_edges(
             "router",
@@ -66,65 +99,85 @@ class LangGraphRouter:
             {
                 "google_tool": "google_tool",
                 "llm_tool": "llm_tool",
+                "speculative": "speculative",
                 "error": END
             }
         )
-        
+
         # Add edges from tools to end
         workflow.add_edge("google_tool", END)
         workflow.add_edge("llm_tool", END)
+        workflow.add_edge("speculative", END)
         
         # Compile the graph
         return workflow.compile()
     
+    def _local_route(self, query: str) -> Optional[str]:
+        """
+        Route clear-cut queries with the keyword classifier.
+        Returns None when the query is ambiguous and needs the LLM router.
+        """
+        explanation = self.classifier.get_classification_explanation(query)
+
+        if explanation["is_mathematical"]:
+            return 'llm_tool'
+
+        search_score = explanation["search_score"]
+        llm_score = explanation["llm_score"]
+
+        if search_score > 0 and llm_score == 0:
+            return 'google_tool'
+        if llm_score > 0 and search_score == 0:
+            return 'llm_tool'
+
+        return None
+
+    @lru_cache(maxsize=4096)
+    def _llm_route(self, query: str) -> tuple:
+        """Ask the routing LLM for a decision; results are memoized per query.
+
+        Returns (decision, confidence): 1.0 for an exact answer, 0.7 when
+        the answer had to be fuzzy-matched, 0.0 for the blind default.
+        """
+        response = self.llm.invoke(self._routing_prompt.format_messages(query=query))
+        decision = response.content.strip().lower()
+
+        # Validate and normalize the decision
+        if decision in self._valid_decisions:
+            return decision, 1.0
+        if 'google' in decision or 'search' in decision:
+            return 'google_tool', 0.7
+        if 'llm' in decision or 'reasoning' in decision or 'explain' in decision:
+            return 'llm_tool', 0.7
+
+        # Default to llm_tool for unclear cases
+        self.logger.warning("Unclear routing decision %r, defaulting to llm_tool", decision)
+        return 'llm_tool', 0.0
+
     def _router_node(self, state: RouterState) -> RouterState:
         """
-        Router node that uses LLM to decide which tool to use.
+        Router node: keyword classifier for the common case, LLM for the rest.
         Returns only 'google_tool' or 'llm_tool'.
         """
         try:
-            self.logger.info(f"Router analyzing query: {state['query']}")
-            
-            # Create the routing prompt
-            routing_prompt = ChatPromptTemplate.from_messages([
-                SystemMessage(content="""You are a router agent.
-                    Decide which tool should handle the user query.
+            self.logger.info("Router analyzing query: %s", state['query'])
 
-                    • If the query asks about recent, live, or factual updates → choose google_search
-                    • If the query asks for reasoning, explanations, or general knowledge → choose llm_client
+            tool_decision = self._local_route(state['query'])
+            confidence = 1.0
+
+            if tool_decision is None:
+                tool_decision, confidence = self._llm_route(' '.join(state['query'].lower().split()))
+
+            self.logger.info("Router decision: %s (confidence %.1f)", tool_decision, confidence)
+
+            # Return only the delta; LangGraph merges it into the state
+            return {"tool_decision": tool_decision, "confidence": confidence}
 
-                    Respond with only one word: 'google_tool' or 'llm_tool'"""),
-                HumanMessage(content=state['query'])
-            ])
-            
-            # Get routing decision from LLM
-            response = self.llm.invoke(routing_prompt.format_messages(query=state['query']))
-            decision = response.content.strip().lower()
-            
-            # Validate and normalize the decision
-            if decision in ['google_tool', 'llm_tool']:
-                tool_decision = decision
-            elif 'google' in decision or 'search' in decision:
-                tool_decision = 'google_tool'
-            elif 'llm' in decision or 'reasoning' in decision or 'explain' in decision:
-                tool_decision = 'llm_tool'
-            else:
-                # Default to llm_tool for unclear cases
-                tool_decision = 'llm_tool'
-                self.logger.warning(f"Unclear routing decision '{decision}', defaulting to llm_tool")
-            
-            self.logger.info(f"Router decision: {tool_decision}")
-            
-            return {
-                **state,
-                "tool_decision": tool_decision
-            }
-            
         except Exception as e:
-            self.logger.error(f"Error in router node: {str(e)}")
+            self.logger.error("Error in router node: %s", e)
             return {
-                **state,
                 "tool_decision": "llm_tool",  # Default fallback
+                "confidence": 0.0,
                 "error": f"Router error: {str(e)}"
             }
     
@@ -135,16 +188,12 @@ class LangGraphRouter:
             result = self.google_searcher.search(state['query'])
             result["source"] = "Google Search"
             result["routing_decision"] = "google_tool"
-            
-            return {
-                **state,
-                "result": result
-            }
+
+            return {"result": result}
             
         except Exception as e:
-            self.logger.error(f"Error in Google tool: {str(e)}")
+            self.logger.error("Error in Google tool: %s", e)
             return {
-                **state,
                 "result": {
                     "query": state['query'],
                     "answer": f"Google search failed: {str(e)}",
@@ -160,16 +209,12 @@ class LangGraphRouter:
             result = self.llm_client.query(state['query'])
             result["source"] = "OpenAI LLM"
             result["routing_decision"] = "llm_tool"
-            
-            return {
-                **state,
-                "result": result
-            }
+
+            return {"result": result}
             
         except Exception as e:
-            self.logger.error(f"Error in LLM tool: {str(e)}")
+            self.logger.error("Error in LLM tool: %s", e)
             return {
-                **state,
                 "result": {
                     "query": state['query'],
                     "answer": f"LLM query failed: {str(e)}",
@@ -178,26 +223,59 @@ class LangGraphRouter:
                 }
             }
     
-    def _route_decision(self, state: RouterState) -> Literal["google_tool", "llm_tool", "error"]:
+    def _speculative_node(self, state: RouterState) -> RouterState:
+        """Run both tools in parallel and keep the better answer.
+
+        Only reached for low-confidence routing decisions when speculative
+        execution is enabled. Latency for these queries drops from the sum
+        of the two tool latencies to their max, at double the API cost.
+        """
+        self.logger.info("Low routing confidence; executing both tools speculatively")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            google_future = pool.submit(self._google_tool_node, state)
+            llm_future = pool.submit(self._llm_tool_node, state)
+
+            google_result = google_future.result()["result"]
+            llm_result = llm_future.result()["result"]
+
+        # Keep whichever tool succeeded; when both did, follow the router's
+        # guess since neither answer is obviously better
+        if "error" in google_result:
+            winner = llm_result
+        elif "error" in llm_result:
+            winner = google_result
+        elif state.get("tool_decision") == "google_tool":
+            winner = google_result
+        else:
+            winner = llm_result
+
+        # Stamp a copy rather than the tool result itself; this node
+        # doesn't own that dict
+        return {"result": {**winner, "speculative": True}}
+
+    def _route_decision(self, state: RouterState) -> Literal["google_tool", "llm_tool", "speculative", "error"]:
         """Conditional routing logic based on router decision"""
         tool_decision = state.get("tool_decision", "llm_tool")
-        
-        if tool_decision == "google_tool":
-            return "google_tool"
-        elif tool_decision == "llm_tool":
-            return "llm_tool"
-        else:
-            self.logger.error(f"Invalid tool decision: {tool_decision}")
+
+        if tool_decision not in ("google_tool", "llm_tool"):
+            self.logger.error("Invalid tool decision: %s", tool_decision)
             return "error"
+
+        if self.speculative and state.get("confidence", 1.0) < 0.5:
+            return "speculative"
+
+        return tool_decision
     
     def process_query(self, query: str) -> Dict[str, Any]:
       
         try:
-            self.logger.info(f"Processing query with LangGraph router: {query}")
+            self.logger.info("Processing query with LangGraph router: %s", query)
             
             initial_state = RouterState(
                 query=query,
                 tool_decision="",
+                confidence=0.0,
                 result={},
                 error=""
             )
@@ -217,11 +295,11 @@ class LangGraphRouter:
             result["routing_method"] = "LangGraph LLM Router"
             result["tool_decision"] = final_state.get("tool_decision", "unknown")
             
-            self.logger.info(f"Query processed successfully with tool: {result.get('tool_decision', 'unknown')}")
+            self.logger.info("Query processed successfully with tool: %s", result.get('tool_decision', 'unknown'))
             return result
             
         except Exception as e:
-            self.logger.error(f"Error processing query with LangGraph: {str(e)}")
+            self.logger.error("Error processing query with LangGraph: %s", e)
             return {
                 "query": query,
                 "answer": f"LangGraph processing failed: {str(e)}",
@@ -239,6 +317,7 @@ class LangGraphRouter:
             initial_state = RouterState(
                 query=query,
                 tool_decision="",
+                confidence=0.0,
                 result={},
                 error=""
             )
@@ -260,3 +339,14 @@ class LangGraphRouter:
                 "routing_method": "LangGraph LLM Router",
                 "error": str(e)
             }
+
+@lru_cache(maxsize=1)
+def get_router() -> LangGraphRouter:
+    """Return a process-wide shared router instance.
+
+    Building a LangGraphRouter creates three HTTP clients with their own
+    connection pools; apps that would otherwise construct a router per
+    request should call this instead so every request reuses the same
+    pooled connections. Call get_router.cache_clear() to force a rebuild.
+    """
+    return LangGraphRouter()
@@ -1,14 +1,48 @@
 
+import asyncio
 import os
 import json
+import time
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import TokenBucket
+from response_cache import ResponseCache
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 -- presence check only
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
 
 class LLMClient:
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4.1", 
+    __slots__ = (
+        'logger', 'api_key', 'model', 'deployment', 'endpoint', 'api_version',
+        'base_url', 'headers', 'session', 'rate_limiter',
+        'rate_limit_retry_delay', 'total_tokens_used', '_cache',
+        '_system_message', '_payload_template', '_connection_ok_until'
+    )
+
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4.1",
                  endpoint: Optional[str] = None, deployment: Optional[str] = None, 
                  api_version: str = "2024-12-01-preview"):
         self.logger = logging.getLogger(__name__)
@@ -37,90 +71,213 @@ class LLMClient:
             'api-key': self.api_key,
             'Content-Type': 'application/json'
         }
-        
-        self.last_request_time = 0
-        self.min_delay = 5.0  
-        self.rate_limit_retry_delay = 60  
+
+        # Pooled session: repeated completions reuse one keep-alive TLS
+        # connection instead of handshaking per request
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Completions are side-effect free, so POST is safe to retry here.
+        # raise_on_status=False keeps the final 429/5xx response visible to
+        # the status-specific handling in _make_api_request.
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=1.0,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "POST"],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        ))
+
+        # Token bucket: a burst of a few prompts goes straight through,
+        # sustained load settles at one request per 5 seconds
+        self.rate_limiter = TokenBucket(rate=0.2, capacity=3)
+        self.rate_limit_retry_delay = 60
         
         self.total_tokens_used = 0
-        
-        self.logger.info(f"Azure OpenAI LLM client initialized with model: {model}, deployment: {self.deployment}")
+        self._connection_ok_until = 0.0
+
+        # Exact-hit cache: repeated prompts skip the API round-trip and
+        # their token cost entirely
+        self._cache = ResponseCache(maxsize=1024, ttl=3600.0)
+
+        # Static payload pieces, built once; only the user message,
+        # max_tokens and temperature vary per call
+        self._system_message = {
+            "role": "system",
+            "content": (
+                "You are a helpful AI assistant. Provide clear, accurate, and concise answers. "
+                "If the question is about mathematics, programming, or technical topics, "
+                "provide step-by-step explanations when appropriate."
+            )
+        }
+        self._payload_template = {
+            "model": self.model,
+            "top_p": 1.0,
+            "frequency_penalty": 2.0,
+            "presence_penalty": 2.0
+        }
+
+        self.logger.info("Azure OpenAI LLM client initialized with model: %s, deployment: %s", model, self.deployment)
     
     def query(self, prompt: str, max_tokens: int = 500, temperature: float = 0.7) -> Dict[str, Any]:
 
         try:
-            self.logger.info(f"Sending query to LLM: {prompt[:50]}...")
-            
+            self.logger.info("Sending query to LLM: %.50s...", prompt)
+
+            cache_key = (self.model, max_tokens, temperature, prompt)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self.logger.debug("Cache hit for prompt: %.50s", prompt)
+                return cached
+
             self._respect_rate_limit()
-            
+
             payload = self._build_payload(prompt, max_tokens, temperature)
-            
+
             response = self._make_api_request(payload)
-            
+
             if not response:
                 return self._create_error_result("Failed to get response from LLM")
-            
+
             result = self._process_response(response, prompt)
-            
+
+            if "error" not in result:
+                self._cache.set(cache_key, result)
+
             self.logger.info("Successfully received response from LLM")
             return result
-            
+
         except Exception as e:
-            self.logger.error(f"Error during LLM query: {str(e)}")
+            self.logger.error("Error during LLM query: %s", e)
             return self._create_error_result(f"LLM query failed: {str(e)}")
     
+    def query_stream(self, prompt: str, max_tokens: int = 500,
+                     temperature: float = 0.7) -> Iterator[str]:
+        """Stream the completion token-by-token as it is generated.
+
+        Yields content fragments as they arrive, so callers can render
+        incrementally instead of waiting for the full answer. Streamed
+        responses bypass the response cache.
+        """
+        self._respect_rate_limit()
+
+        payload = self._build_payload(prompt, max_tokens, temperature)
+        payload["stream"] = True
+
+        url = f"{self.base_url}?api-version={self.api_version}"
+
+        try:
+            with self.session.post(url, data=_json_dumps(payload),
+                                   timeout=30, stream=True) as response:
+                response.raise_for_status()
+
+                # Azure OpenAI streams SSE frames: "data: {...}" per line,
+                # terminated by "data: [DONE]"
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue
+
+                    data = line[6:]
+                    if data == b"[DONE]":
+                        break
+
+                    choices = _json_loads(data).get('choices', [])
+                    if not choices:
+                        continue
+
+                    content = choices[0].get('delta', {}).get('content')
+                    if content:
+                        yield content
+
+        except requests.exceptions.RequestException as e:
+            self.logger.error("Streaming request failed: %s", e)
+
+    def query_batch(self, prompts: List[str], max_tokens: int = 500,
+                    temperature: float = 0.7) -> List[Dict[str, Any]]:
+        """Run several independent prompts concurrently on one async client.
+
+        Falls back to sequential query() calls when httpx is not installed.
+        """
+        if httpx is None:
+            return [self.query(prompt, max_tokens, temperature) for prompt in prompts]
+
+        return asyncio.run(self._query_batch_async(prompts, max_tokens, temperature))
+
+    async def _query_batch_async(self, prompts: List[str], max_tokens: int,
+                                 temperature: float) -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(4)
+        url = f"{self.base_url}?api-version={self.api_version}"
+
+        async with httpx.AsyncClient(http2=_HTTP2, headers=self.headers, timeout=30.0) as client:
+            async def query_one(prompt: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._query_async(client, url, prompt, max_tokens, temperature)
+
+            return list(await asyncio.gather(*(query_one(prompt) for prompt in prompts)))
+
+    async def _query_async(self, client, url: str, prompt: str, max_tokens: int,
+                           temperature: float) -> Dict[str, Any]:
+        try:
+            self.logger.info("Sending query to LLM: %.50s...", prompt)
+
+            payload = self._build_payload(prompt, max_tokens, temperature)
+
+            response = await client.post(url, content=_json_dumps(payload))
+            response.raise_for_status()
+
+            return self._process_response(_json_loads(response.content), prompt)
+
+        except Exception as e:
+            self.logger.error("Error during LLM query: %s", e)
+            return self._create_error_result(f"LLM query failed: {str(e)}")
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _respect_rate_limit(self):
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_delay:
-            sleep_time = self.min_delay - time_since_last
-            self.logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        self.rate_limiter.acquire()
     
     def _build_payload(self, prompt: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
-        system_message = (
-            "You are a helpful AI assistant. Provide clear, accurate, and concise answers. "
-            "If the question is about mathematics, programming, or technical topics, "
-            "provide step-by-step explanations when appropriate."
-        )
-        
-        payload = {
-            "model": self.model,
+        return {
+            **self._payload_template,
             "messages": [
-                {"role": "system", "content": system_message},
+                self._system_message,
                 {"role": "user", "content": prompt}
             ],
             "max_tokens": max_tokens,
-            "temperature": temperature,
-            "top_p": 1.0,
-            "frequency_penalty": 2.0,
-            "presence_penalty": 2.0
+            "temperature": temperature
         }
-        
-        return payload
     
     def _make_api_request(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
             url = f"{self.base_url}?api-version={self.api_version}"
             
-            response = requests.post(
+            # Serialize the payload with orjson as well; the session already
+            # carries the JSON content-type header
+            response = self.session.post(
                 url,
-                headers=self.headers,
-                json=payload,
+                data=_json_dumps(payload),
                 timeout=30
             )
             
             response.raise_for_status()
-            
-            return response.json()
+
+            return _json_loads(response.content)
             
         except requests.exceptions.HTTPError as http_error:
             if http_error.response.status_code == 429:
                 self.logger.warning("Rate limit exceeded. Please wait before making another request.")
-                self.last_request_time = time.time() + self.rate_limit_retry_delay
+                self.rate_limiter.penalize(self.rate_limit_retry_delay)
                 return None
             elif http_error.response.status_code == 401:
                 self.logger.error("Authentication failed. Please check your Azure OpenAI API key.")
@@ -129,13 +286,13 @@ class LLMClient:
                 self.logger.error("Access forbidden. Please check your Azure OpenAI permissions and deployment.")
                 return None
             else:
-                self.logger.error(f"HTTP error {http_error.response.status_code}: {str(http_error)}")
+                self.logger.error("HTTP error %d: %s", http_error.response.status_code, http_error)
                 return None
         except requests.exceptions.RequestException as e:
-            self.logger.error(f"API request failed: {str(e)}")
+            self.logger.error("API request failed: %s", e)
             return None
         except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse API response: {str(e)}")
+            self.logger.error("Failed to parse API response: %s", e)
             return None
     
     def _process_response(self, response: Dict[str, Any], original_prompt: str) -> Dict[str, Any]:
@@ -165,7 +322,7 @@ class LLMClient:
             return result
             
         except Exception as e:
-            self.logger.error(f"Error processing response: {str(e)}")
+            self.logger.error("Error processing response: %s", e)
             return self._create_error_result(f"Failed to process response: {str(e)}")
     
     def _create_error_result(self, error_message: str) -> Dict[str, Any]:
@@ -176,6 +333,9 @@ class LLMClient:
             "error": error_message
         }
     
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
     def get_usage_stats(self) -> Dict[str, Any]:
         return {
             "total_tokens_used": self.total_tokens_used,
@@ -197,17 +357,23 @@ class LLMClient:
     
     def test_connection(self) -> bool:
 
+        # Probe the free models listing endpoint instead of paying for a
+        # real completion; a successful check is trusted for 5 minutes so
+        # repeated health probes don't hammer the endpoint
+        if time.monotonic() < self._connection_ok_until:
+            return True
+
         try:
-            test_payload = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": "Hello"}],
-                "max_tokens": 10,
-                "temperature": 0.0
-            }
-            
-            response = self._make_api_request(test_payload)
-            return response is not None
-            
+            url = f"{self.endpoint}/openai/models?api-version={self.api_version}"
+            response = self.session.get(url, timeout=5)
+
+            if response.ok:
+                self._connection_ok_until = time.monotonic() + 300
+                return True
+
+            self.logger.error("Connection test failed with status %d", response.status_code)
+            return False
+
         except Exception as e:
-            self.logger.error(f"Connection test failed: {str(e)}")
+            self.logger.error("Connection test failed: %s", e)
             return False
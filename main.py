@@ -7,6 +7,7 @@ to Google search or an LLM based on intelligent analysis of the query content.
 
 import os
 import sys
+import threading
 from typing import Dict, Any
 import logging
 
@@ -17,44 +18,92 @@ except ImportError:
     print("python-dotenv not installed. Install with: pip install python-dotenv")
     print("Or set environment variables manually.")
 
-from langgraph_router import LangGraphRouter
 from utils import setup_logging, display_banner
 from ui_components import UIComponents
+from response_cache import ResponseCache
+
+# Queries about live data are the worst cache candidates: a stale hit is
+# an outright wrong answer. Anything mentioning these bypasses the cache.
+_VOLATILE_KEYWORDS = frozenset({
+    'current', 'latest', 'recent', 'today', 'now',
+    'weather', 'temperature', 'news', 'stock price'
+})
+
+# Static shape of a process_query failure; only error/query vary per call
+_ERROR_TEMPLATE = {
+    "error": "",
+    "query": "",
+    "source": "Error Handler",
+    "routing_method": "LangGraph Router (Error)"
+}
 
 class IntelligentQueryRouter:
-    
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        
-        # Use LangGraph-based LLM router instead of manual classifier
-        self.router = LangGraphRouter()
-        
+
+        # Imported lazily: langgraph_router pulls in the whole LangGraph/
+        # LangChain stack, which would otherwise delay startup of anything
+        # that imports this module without constructing a router
+        from langgraph_router import LangGraphRouter
+
+        # Use LangGraph-based LLM router instead of manual classifier.
+        # ROUTER_SPECULATIVE=1 runs both tools in parallel for ambiguous
+        # queries and keeps the better answer (at double the API cost).
+        speculative = os.getenv('ROUTER_SPECULATIVE', '').lower() in ('1', 'true', 'yes')
+        self.router = LangGraphRouter(speculative=speculative)
+
+        # Repeat questions answer from here without touching the router,
+        # the classifier, or the network
+        self._cache = ResponseCache(maxsize=1024, ttl=3600.0)
+
         self.logger.info("Intelligent Query Router with LangGraph LLM routing (Azure OpenAI) initialized successfully")
-    
+
     def process_query(self, query: str) -> Dict[str, Any]:
         try:
-            self.logger.info(f"Processing query with LangGraph router: {query}")
-            
+            self.logger.info("Processing query with LangGraph router: %s", query)
+
+            cache_key = ' '.join(query.lower().split())
+            cacheable = not any(keyword in cache_key for keyword in _VOLATILE_KEYWORDS)
+
+            if cacheable:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    self.logger.debug("Cache hit for query: %s", query)
+                    return cached
+
             # Use the LangGraph router to process the query
             result = self.router.process_query(query)
-            
-            self.logger.info(f"Query processed successfully with tool: {result.get('tool_decision', 'unknown')}")
+
+            if cacheable and "error" not in result:
+                self._cache.set(cache_key, result)
+
+            self.logger.info("Query processed successfully with tool: %s", result.get('tool_decision', 'unknown'))
             return result
-            
+
         except Exception as e:
-            self.logger.error(f"Error processing query: {str(e)}")
-            return {
-                "error": str(e),
-                "query": query,
-                "source": "Error Handler",
-                "routing_method": "LangGraph Router (Error)"
-            }
+            self.logger.error("Error processing query: %s", e)
+            return {**_ERROR_TEMPLATE, "error": str(e), "query": query}
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
     
+    def _warm_connections(self):
+        """Open the pooled TLS connections before the first query needs them."""
+        try:
+            self.router.llm_client.test_connection()
+        except Exception as e:
+            self.logger.debug("Connection warmup failed: %s", e)
+
     def run_interactive_mode(self):
         """Run the interactive CLI mode with beautiful UI"""
         UIComponents.print_banner()
         UIComponents.print_welcome()
-        
+
+        # Warm up the LLM connection while the user types their first
+        # question; a daemon thread so quitting immediately isn't blocked
+        threading.Thread(target=self._warm_connections, daemon=True).start()
+
         while True:
             try:
                 query = UIComponents.get_user_input()
@@ -77,14 +126,14 @@ class IntelligentQueryRouter:
                 break
             except Exception as e:
                 UIComponents.print_error(f"An error occurred: {str(e)}")
-                self.logger.error(f"Unexpected error in interactive mode: {str(e)}")
+                self.logger.error("Unexpected error in interactive mode: %s", e)
     
     def get_routing_explanation(self, query: str) -> Dict[str, Any]:
         """Get detailed explanation of the routing decision for a query"""
         try:
             return self.router.get_routing_explanation(query)
         except Exception as e:
-            self.logger.error(f"Error getting routing explanation: {str(e)}")
+            self.logger.error("Error getting routing explanation: %s", e)
             return {
                 "query": query,
                 "tool_decision": "error",
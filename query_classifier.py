@@ -1,155 +1,260 @@
 
 import re
-from typing import List, Dict, Set
+from functools import lru_cache
+from typing import List, Dict, Set, Tuple
 import logging
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 class QueryClassifier:
-    
+
+    # Keyword-matching backends are built once and shared across instances so
+    # repeated QueryClassifier() constructions don't pay the build cost again.
+    # Hyperscan (JIT'd multi-pattern DFA) is preferred, then Aho-Corasick,
+    # then the plain per-keyword substring scan.
+    _search_automaton = None
+    _llm_automaton = None
+    _hs_database = None
+    _hs_scratch = None
+    _hs_keywords = None
+
+    _QUESTION_STARTERS = frozenset({'what', 'who', 'when', 'where', 'which', 'how'})
+
+    # Strong factual indicators worth an extra +2 each. All are plain
+    # literals that also live in search_keywords, so the keyword scan has
+    # already found them and the bonus is a set intersection, not a rescan
+    _FACTUAL_BONUS = frozenset({
+        'capital of', 'population of', 'currency of', 'president of',
+        'ceo of', 'founded in', 'located in'
+    })
+
+    # Immutable keyword tables, declared once at class level so every
+    # instance shares the same frozenset objects
+    search_keywords = frozenset({
+        'what is', 'who is', 'when is', 'where is', 'which is',
+        'capital of', 'population of', 'currency of', 'language of',
+        'president of', 'prime minister of', 'ceo of', 'founder of',
+        'located in', 'founded in', 'established in', 'created in',
+        'current', 'latest', 'recent', 'today', 'now',
+        'weather', 'temperature', 'news', 'stock price',
+        'address', 'phone number', 'website', 'email',
+        'how many', 'how much', 'how long', 'how far',
+        'distance between', 'time in', 'date of', 'birthday of'
+    })
+
+    llm_keywords = frozenset({
+        'explain', 'describe', 'analyze', 'compare', 'contrast',
+        'why', 'how does', 'how to', 'what if', 'suppose',
+        'solve', 'calculate', 'compute', 'find the value',
+        'write', 'create', 'generate', 'make', 'build',
+        'code', 'program', 'function', 'algorithm',
+        'opinion', 'think', 'believe', 'recommend',
+        'pros and cons', 'advantages', 'disadvantages',
+        'best way', 'better', 'improve', 'optimize',
+        'debug', 'fix', 'error', 'problem', 'issue',
+        'tutorial', 'guide', 'steps', 'process',
+        'concept', 'theory', 'definition', 'meaning',
+        'example', 'sample', 'demo', 'illustration'
+    })
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        
-        self.search_keywords = {
-            'what is', 'who is', 'when is', 'where is', 'which is',
-            'capital of', 'population of', 'currency of', 'language of',
-            'president of', 'prime minister of', 'ceo of', 'founder of',
-            'located in', 'founded in', 'established in', 'created in',
-            'current', 'latest', 'recent', 'today', 'now',
-            'weather', 'temperature', 'news', 'stock price',
-            'address', 'phone number', 'website', 'email',
-            'how many', 'how much', 'how long', 'how far',
-            'distance between', 'time in', 'date of', 'birthday of'
-        }
-        
-        self.llm_keywords = {
-            'explain', 'describe', 'analyze', 'compare', 'contrast',
-            'why', 'how does', 'how to', 'what if', 'suppose',
-            'solve', 'calculate', 'compute', 'find the value',
-            'write', 'create', 'generate', 'make', 'build',
-            'code', 'program', 'function', 'algorithm',
-            'opinion', 'think', 'believe', 'recommend',
-            'pros and cons', 'advantages', 'disadvantages',
-            'best way', 'better', 'improve', 'optimize',
-            'debug', 'fix', 'error', 'problem', 'issue',
-            'tutorial', 'guide', 'steps', 'process',
-            'concept', 'theory', 'definition', 'meaning',
-            'example', 'sample', 'demo', 'illustration'
-        }
-        
-        self.math_patterns = [
-            r'\d+\s*[+\-*/]\s*\d+',  # Basic arithmetic
-            r'[a-zA-Z]\s*[+\-*/]\s*\d+',  # Variable operations
-            r'solve|calculate|compute|find.*value',  # Math keywords
-            r'equation|formula|function',  # Math concepts
-            r'x\s*[+\-*/]|y\s*[+\-*/]',  # Variable equations
-            r'\d+\s*[+\-*/]\s*[a-zA-Z]',  # Number-variable operations
+
+
+        # Patterns are compiled once here; the scoring loops then call the
+        # compiled objects directly instead of re-parsing pattern strings
+        # through re.search on every classification.
+        # The math check only asks whether any pattern matches, so the whole
+        # group is folded into one alternation and a single engine pass
+        # answers it. Input is already lowercased by _normalize_query, so
+        # no IGNORECASE: the engine keeps its plain literal matching path
+        self.math_pattern = re.compile(
+            '|'.join(f'(?:{pattern})' for pattern in (
+                r'\d+\s*[+\-*/]\s*\d+',  # Basic arithmetic
+                r'[a-z]\s*[+\-*/]\s*\d+',  # Variable operations
+                r'solve|calculate|compute|find.*value',  # Math keywords
+                r'equation|formula|function',  # Math concepts
+                r'x\s*[+\-*/]|y\s*[+\-*/]',  # Variable equations
+                r'\d+\s*[+\-*/]\s*[a-z]',  # Number-variable operations
+            ))
+        )
+
+        self.analytical_patterns = [
+            re.compile(pattern)
+            for pattern in (
+                r'explain.*how',
+                r'why.*happen',
+                r'what.*think',
+                r'compare.*and',
+                r'pros.*cons',
+                r'best.*way',
+                r'how.*work',
+                r'what.*mean'
+            )
         ]
-        
+
+
+        if hyperscan is not None:
+            self._build_hyperscan_database()
+        elif ahocorasick is not None:
+            self._build_automatons()
+
         self.logger.info("Query classifier initialized")
-    
-    def classify_query(self, query: str) -> str:
-    
-        query_lower = query.lower().strip()
-        
-        if self._is_mathematical_query(query_lower):
-            self.logger.debug("Query classified as mathematical - using LLM")
-            return "llm"
-        
-        search_score = self._calculate_search_score(query_lower)
-        llm_score = self._calculate_llm_score(query_lower)
-        
-        self.logger.debug(f"Search score: {search_score}, LLM score: {llm_score}")
-        
-        if search_score > llm_score:
-            return "search"
-        elif llm_score > search_score:
-            return "llm"
+
+    @classmethod
+    def _build_automaton(cls, keywords: Set[str]):
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+
+    def _build_automatons(self):
+        if QueryClassifier._search_automaton is None:
+            QueryClassifier._search_automaton = self._build_automaton(self.search_keywords)
+            QueryClassifier._llm_automaton = self._build_automaton(self.llm_keywords)
+
+    def _build_hyperscan_database(self):
+        if QueryClassifier._hs_database is None:
+            keywords = [("search", keyword) for keyword in sorted(self.search_keywords)]
+            keywords += [("llm", keyword) for keyword in sorted(self.llm_keywords)]
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[re.escape(keyword).encode() for _, keyword in keywords],
+                ids=list(range(len(keywords))),
+                flags=[hyperscan.HS_FLAG_CASELESS] * len(keywords)
+            )
+            QueryClassifier._hs_database = database
+            QueryClassifier._hs_scratch = hyperscan.Scratch(database)
+            QueryClassifier._hs_keywords = tuple(keywords)
+
+    @staticmethod
+    def _on_hyperscan_match(pattern_id, start, end, flags, matched_ids):
+        matched_ids.add(pattern_id)
+
+    def _match_keywords(self, query: str) -> Tuple[Set[str], Set[str]]:
+        """Find all search/LLM keywords contained in the query in one pass each."""
+        if self._hs_database is not None:
+            matched_ids = set()
+            self._hs_database.scan(
+                query.encode(),
+                match_event_handler=self._on_hyperscan_match,
+                scratch=self._hs_scratch,
+                context=matched_ids
+            )
+            search_matches = set()
+            llm_matches = set()
+            for pattern_id in matched_ids:
+                bucket, keyword = self._hs_keywords[pattern_id]
+                if bucket == "search":
+                    search_matches.add(keyword)
+                else:
+                    llm_matches.add(keyword)
+        elif self._search_automaton is not None:
+            search_matches = {keyword for _, keyword in self._search_automaton.iter(query)}
+            llm_matches = {keyword for _, keyword in self._llm_automaton.iter(query)}
         else:
-            return "llm"
+            search_matches = {keyword for keyword in self.search_keywords if keyword in query}
+            llm_matches = {keyword for keyword in self.llm_keywords if keyword in query}
+        return search_matches, llm_matches
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Lowercase and collapse whitespace so equivalent queries share a cache entry."""
+        return ' '.join(query.lower().split())
+
+    def classify_query(self, query: str) -> str:
+        return self._classify_normalized(self._normalize_query(query))
+
+    def classify_batch(self, queries: List[str]) -> List[str]:
+        """Classify many queries in one call, deduplicating repeated queries."""
+        return [self._classify_normalized(self._normalize_query(query)) for query in queries]
+
+    def _classify_normalized(self, query_lower: str) -> str:
+        return self._analyze(query_lower)["classification"]
+
+    @lru_cache(maxsize=4096)
+    def _analyze(self, query_lower: str) -> Dict[str, any]:
+        """Run every classifier check in one pass over the query.
+
+        classify_query and get_classification_explanation are both thin
+        views over this cached result, so the common "classify then
+        explain" pair analyzes the query once.
+        """
+        is_math = self._is_mathematical_query(query_lower)
+
+        # Split once and share the word list between both scorers
+        words = query_lower.split()
+        search_matches, llm_matches = self._match_keywords(query_lower)
+        search_score = self._calculate_search_score(query_lower, search_matches, words)
+        llm_score = self._calculate_llm_score(query_lower, llm_matches, words)
+
+        self.logger.debug("Search score: %d, LLM score: %d", search_score, llm_score)
+
+        # LLM wins ties, so a single compare decides the non-math case
+        classification = "llm" if is_math or search_score <= llm_score else "search"
+
+        return {
+            "classification": classification,
+            "search_score": search_score,
+            "llm_score": llm_score,
+            "is_mathematical": is_math,
+            "matched_search_keywords": sorted(search_matches),
+            "matched_llm_keywords": sorted(llm_matches)
+        }
     
     def _is_mathematical_query(self, query: str) -> bool:
    
-        for pattern in self.math_patterns:
-            if re.search(pattern, query, re.IGNORECASE):
-                return True
-        return False
+        return self.math_pattern.search(query) is not None
     
-    def _calculate_search_score(self, query: str) -> int:
- 
-        score = 0
-        
-        for keyword in self.search_keywords:
-            if keyword in query:
-                score += 1
-        
-        question_starters = ['what', 'who', 'when', 'where', 'which', 'how']
-        first_word = query.split()[0] if query.split() else ""
-        if first_word in question_starters:
+    def _calculate_search_score(self, query: str, matches: Set[str] = None,
+                                words: List[str] = None) -> int:
+
+        if matches is None:
+            matches, _ = self._match_keywords(query)
+        if words is None:
+            words = query.split()
+
+        score = len(matches)
+
+        if words and words[0] in self._QUESTION_STARTERS:
             score += 1
-        
-        factual_patterns = [
-            r'capital of',
-            r'population of',
-            r'currency of',
-            r'president of',
-            r'ceo of',
-            r'founded in',
-            r'located in'
-        ]
-        
-        for pattern in factual_patterns:
-            if re.search(pattern, query):
-                score += 2
-        
+
+        score += 2 * len(matches & self._FACTUAL_BONUS)
+
         return score
     
-    def _calculate_llm_score(self, query: str) -> int:
-
-        score = 0
-        
-        for keyword in self.llm_keywords:
-            if keyword in query:
-                score += 1
-        
-        analytical_patterns = [
-            r'explain.*how',
-            r'why.*happen',
-            r'what.*think',
-            r'compare.*and',
-            r'pros.*cons',
-            r'best.*way',
-            r'how.*work',
-            r'what.*mean'
-        ]
-        
-        for pattern in analytical_patterns:
-            if re.search(pattern, query):
+    def _calculate_llm_score(self, query: str, matches: Set[str] = None,
+                             words: List[str] = None) -> int:
+
+        if matches is None:
+            _, matches = self._match_keywords(query)
+        if words is None:
+            words = query.split()
+
+        score = len(matches)
+
+        for pattern in self.analytical_patterns:
+            if pattern.search(query):
                 score += 2
-        
-        if len(query.split()) > 5:
+
+        if len(words) > 5:
             score += 1
-        
+
         return score
     
     def get_classification_explanation(self, query: str) -> Dict[str, any]:
 
-        query_lower = query.lower().strip()
-        
-        explanation = {
-            "query": query,
-            "classification": self.classify_query(query),
-            "search_score": self._calculate_search_score(query_lower),
-            "llm_score": self._calculate_llm_score(query_lower),
-            "is_mathematical": self._is_mathematical_query(query_lower),
-            "matched_search_keywords": [],
-            "matched_llm_keywords": []
-        }
-        
-        for keyword in self.search_keywords:
-            if keyword in query_lower:
-                explanation["matched_search_keywords"].append(keyword)
-        
-        for keyword in self.llm_keywords:
-            if keyword in query_lower:
-                explanation["matched_llm_keywords"].append(keyword)
-        
+        explanation = dict(self._analyze(self._normalize_query(query)))
+        explanation["query"] = query
+        explanation["matched_search_keywords"] = list(explanation["matched_search_keywords"])
+        explanation["matched_llm_keywords"] = list(explanation["matched_llm_keywords"])
         return explanation
@@ -0,0 +1,51 @@
+
+import asyncio
+import time
+from threading import Lock
+
+class TokenBucket:
+    """Token-bucket rate limiter that allows short bursts.
+
+    Tokens refill continuously at `rate` per second up to `capacity`, so a
+    burst of up to `capacity` calls proceeds immediately and sustained load
+    settles at `rate` calls per second. Works for sync and async callers.
+    """
+
+    __slots__ = ('rate', 'capacity', '_tokens', '_updated', '_lock')
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def _reserve(self) -> float:
+        """Take one token (possibly going negative) and return the wait time."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            deficit = 1.0 - self._tokens
+            self._tokens -= 1.0
+
+            return deficit / self.rate if deficit > 0 else 0.0
+
+    def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, seconds: float) -> None:
+        """Push the next available token at least `seconds` into the future."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._updated = now
@@ -0,0 +1,70 @@
+
+import copy
+import time
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional
+
+class ResponseCache:
+    """Small in-memory LRU cache with per-entry TTL for API responses.
+
+    Values are deep-copied on both set and get, so callers can freely
+    mutate what they passed in or what they got back without corrupting
+    the cached entry — response dicts here are small, so the copy cost
+    is negligible next to the API round-trip being saved.
+    """
+
+    __slots__ = ('logger', 'maxsize', 'ttl', '_entries', '_lock', 'hits', 'misses')
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0):
+        self.logger = logging.getLogger(__name__)
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl
+            }
@@ -11,8 +11,12 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Add the current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Make the project root importable when this file is run directly;
+# under python -m pytest from the root this resolves to a path that
+# is already present and is skipped
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
 from langgraph_router import LangGraphRouter
 from utils import setup_logging
@@ -3,30 +3,29 @@ Beautiful CLI UI Components using Rich library
 This module provides reusable UI components for the Intelligent Query Router
 """
 
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.markdown import Markdown
-from rich.table import Table
 from rich.prompt import Prompt, Confirm
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.syntax import Syntax
-from rich.layout import Layout
-from rich.text import Text
 from rich import box
-from typing import List, Dict, Any, Optional
-import time
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any
+import re
+import signal
+import sys
+
+# Matches any character that suggests markdown formatting; one compiled
+# regex search replaces a Python-level loop of substring scans
+_MD_MARKER_RE = re.compile(r'[#*`\-]|1\.')
 
 # Initialize console
 console = Console()
 
-
-class UIComponents:
-    """Collection of beautiful UI components for the CLI"""
-    
-    @staticmethod
-    def print_banner():
-        """Display a beautiful welcome banner"""
-        banner_text = """
+# Static renderables built once at import; Panels and markup strings are
+# immutable for our purposes, so every call can print the same objects
+# instead of re-parsing the markup and rebuilding the Panel each time
+_BANNER_TEXT = """
 [bold cyan]╔══════════════════════════════════════════════════════════════════════════════╗[/bold cyan]
 [bold cyan]║[/bold cyan]                                                                              [bold cyan]║[/bold cyan]
 [bold cyan]║[/bold cyan]                    [bold magenta]🤖 Intelligent Query Router 🤖[/bold magenta]                           [bold cyan]║[/bold cyan]
@@ -43,24 +42,103 @@ class UIComponents:
 [bold cyan]║[/bold cyan]                                                                              [bold cyan]║[/bold cyan]
 [bold cyan]╚══════════════════════════════════════════════════════════════════════════════╝[/bold cyan]
         """
-        console.print(banner_text)
-    
+
+# Render the banner markup to its final ANSI string once; print_banner
+# then writes that string straight to the console's file, so the 200+
+# style tags are tokenized a single time per process instead of per call
+with console.capture() as _capture:
+    console.print(_BANNER_TEXT)
+_BANNER_ANSI = _capture.get()
+del _capture
+
+_WELCOME_PANEL = Panel(
+    "[bold white]Ask me anything - I'll automatically choose the best tool to answer your question.[/bold white]\n\n"
+    "[bold yellow]📝 Examples:[/bold yellow]\n"
+    "  [cyan]•[/cyan] [white]'What is the capital of India?'[/white] → [green]Google Search[/green]\n"
+    "  [cyan]•[/cyan] [white]'Solve 2x + 5 = 15'[/white] → [blue]AI Language Model[/blue]\n"
+    "  [cyan]•[/cyan] [white]'What is machine learning?'[/white] → [blue]AI Language Model[/blue]\n\n"
+    "[dim]Type [bold]'quit'[/bold], [bold]'exit'[/bold], or [bold]'q'[/bold] to stop the program.[/dim]",
+    title="[bold green]✨ Welcome[/bold green]",
+    border_style="green",
+    box=box.ROUNDED
+)
+
+_GOODBYE_PANEL = Panel(
+    "[bold white]Thank you for using the Intelligent Query Router![/bold white]\n"
+    "[dim]Have a great day! 🌟[/dim]",
+    title="[bold cyan]👋 Goodbye[/bold cyan]",
+    border_style="cyan",
+    box=box.ROUNDED
+)
+
+# Surrounding blank lines are part of the group, so each of these is one
+# console.print instead of a render round-trip per blank line
+_WELCOME_GROUP = Group(_WELCOME_PANEL, "")
+_GOODBYE_GROUP = Group("", _GOODBYE_PANEL, "")
+
+@lru_cache(maxsize=128)
+def _render_markdown(text: str):
+    """Parse markdown once per distinct answer; repeats reuse the parse.
+
+    No try/except: Markdown() accepts any string (CommonMark has no parse
+    errors), so the old fallback guarded a failure that cannot happen.
+    """
+    return Markdown(text)
+
+
+# Cached separator line; console.width costs a terminal-size ioctl per
+# lookup, so the line is built once and only rebuilt after the terminal
+# is resized (SIGWINCH clears the cache)
+_separator_cache = []
+
+def _invalidate_separator(signum=None, frame=None):
+    _separator_cache.clear()
+
+# Only cache when resize invalidation is actually in place; otherwise a
+# resized terminal would keep getting the stale width forever
+_separator_cacheable = False
+if hasattr(signal, 'SIGWINCH'):
+    try:
+        signal.signal(signal.SIGWINCH, _invalidate_separator)
+        _separator_cacheable = True
+    except ValueError:
+        # signal handlers can only be installed from the main thread
+        pass
+
+
+# One-line status messages bypass Rich's render pipeline on a TTY and
+# write the hard-coded SGR escapes directly; when stdout is redirected
+# Rich stays in the loop so color stripping keeps working
+_STATUS_TTY = sys.stdout.isatty()
+_ANSI_RESET = "\x1b[0m"
+
+def _print_status(ansi: str, style: str, prefix: str, message: str) -> None:
+    if _STATUS_TTY:
+        sys.stdout.write(f"{ansi}{prefix}{message}{_ANSI_RESET}\n")
+    else:
+        console.print(f"[{style}]{prefix}{message}[/{style}]")
+
+
+# Per-role styling for conversation history panels
+_ROLE_STYLES = {
+    "user": ("👤", "cyan", "You"),
+    "assistant": ("🤖", "green", "AI"),
+}
+
+
+class UIComponents:
+    """Collection of beautiful UI components for the CLI"""
+
+    @staticmethod
+    def print_banner():
+        """Display a beautiful welcome banner"""
+        console.file.write(_BANNER_ANSI)
+        console.file.flush()
+
     @staticmethod
     def print_welcome():
         """Display welcome message with examples"""
-        welcome_panel = Panel(
-            "[bold white]Ask me anything - I'll automatically choose the best tool to answer your question.[/bold white]\n\n"
-            "[bold yellow]📝 Examples:[/bold yellow]\n"
-            "  [cyan]•[/cyan] [white]'What is the capital of India?'[/white] → [green]Google Search[/green]\n"
-            "  [cyan]•[/cyan] [white]'Solve 2x + 5 = 15'[/white] → [blue]AI Language Model[/blue]\n"
-            "  [cyan]•[/cyan] [white]'What is machine learning?'[/white] → [blue]AI Language Model[/blue]\n\n"
-            "[dim]Type [bold]'quit'[/bold], [bold]'exit'[/bold], or [bold]'q'[/bold] to stop the program.[/dim]",
-            title="[bold green]✨ Welcome[/bold green]",
-            border_style="green",
-            box=box.ROUNDED
-        )
-        console.print(welcome_panel)
-        console.print()
+        console.print(_WELCOME_GROUP)
     
     @staticmethod
     def get_user_input(prompt_text: str = "Your question") -> str:
@@ -75,121 +153,123 @@ class UIComponents:
     @staticmethod
     def display_result(result: Dict[str, Any]):
         """Display query result in a beautiful format"""
-        console.print()
-        
+        # Collect the panels and render everything in one console.print,
+        # so Rich lays out and flushes once per result instead of once
+        # per panel
+        renderables = [""]
+
         # Handle errors
         if "error" in result:
-            error_panel = Panel(
+            renderables.append(Panel(
                 f"[bold red]{result['error']}[/bold red]",
                 title="[bold red]❌ Error[/bold red]",
                 border_style="red",
                 box=box.ROUNDED
-            )
-            console.print(error_panel)
-            console.print()
+            ))
+            renderables.append("")
+            console.print(Group(*renderables))
             return
-        
-        # Create info table
-        info_table = Table(show_header=False, box=None, padding=(0, 1))
-        info_table.add_column("Label", style="bold cyan")
-        info_table.add_column("Value", style="white")
-        
-        if "query" in result:
-            info_table.add_row("📝 Query:", result['query'])
-        
-        if "source" in result:
-            source_icon = "🔍" if "Google" in result['source'] else "🤖"
-            info_table.add_row(f"{source_icon} Tool Used:", result['source'])
-        
-        if "query_type" in result:
-            type_color = "green" if result['query_type'] == "search" else "blue"
-            info_table.add_row("🏷️  Query Type:", f"[{type_color}]{result['query_type']}[/{type_color}]")
-        
-        # Display info panel
-        info_panel = Panel(
-            info_table,
+
+        # The info block is just label/value lines, so plain markup text
+        # avoids Rich's table measurement and layout pass entirely
+        info_lines = []
+
+        # Single .get per key instead of a membership test plus a lookup
+        query = result.get("query")
+        if query is not None:
+            info_lines.append(f"[bold cyan]📝 Query:[/bold cyan] [white]{query}[/white]")
+
+        source = result.get("source")
+        if source is not None:
+            source_icon = "🔍" if "Google" in source else "🤖"
+            info_lines.append(f"[bold cyan]{source_icon} Tool Used:[/bold cyan] [white]{source}[/white]")
+
+        query_type = result.get("query_type")
+        if query_type is not None:
+            type_color = "green" if query_type == "search" else "blue"
+            info_lines.append(f"[bold cyan]🏷️  Query Type:[/bold cyan] [{type_color}]{query_type}[/{type_color}]")
+
+        renderables.append(Panel(
+            "\n".join(info_lines),
             title="[bold yellow]📊 Query Information[/bold yellow]",
             border_style="yellow",
             box=box.ROUNDED
-        )
-        console.print(info_panel)
-        console.print()
-        
+        ))
+        renderables.append("")
+
         # Display answer
-        if "answer" in result:
+        answer_text = result.get("answer")
+        if answer_text is not None:
             # Try to render as markdown if it looks like markdown
-            answer_text = result['answer']
-            if any(marker in answer_text for marker in ['#', '**', '*', '`', '-', '1.']):
-                try:
-                    answer_content = Markdown(answer_text)
-                except:
-                    answer_content = answer_text
+            if _MD_MARKER_RE.search(answer_text):
+                answer_content = _render_markdown(answer_text)
             else:
                 answer_content = answer_text
-            
-            answer_panel = Panel(
+
+            renderables.append(Panel(
                 answer_content,
                 title="[bold green]💡 Answer[/bold green]",
                 border_style="green",
                 box=box.ROUNDED
-            )
-            console.print(answer_panel)
-            console.print()
-        
+            ))
+            renderables.append("")
+
         # Display sources/URLs
-        if "urls" in result and result["urls"]:
-            sources_text = Text()
-            for i, url in enumerate(result["urls"][:5], 1):
-                sources_text.append(f"{i}. ", style="bold cyan")
-                sources_text.append(f"{url}\n", style="blue underline")
-            
-            sources_panel = Panel(
+        urls = result.get("urls")
+        if urls:
+            # One markup string parsed by Rich in a single pass, instead
+            # of two Text.append span allocations per URL; islice iterates
+            # the first five URLs without copying the list
+            sources_text = "\n".join(
+                f"[bold cyan]{i}.[/bold cyan] [blue underline]{url}[/blue underline]"
+                for i, url in enumerate(islice(urls, 5), 1)
+            )
+
+            renderables.append(Panel(
                 sources_text,
                 title="[bold magenta]🔗 Sources[/bold magenta]",
                 border_style="magenta",
                 box=box.ROUNDED
-            )
-            console.print(sources_panel)
-            console.print()
+            ))
+            renderables.append("")
+
+        console.print(Group(*renderables))
     
     @staticmethod
     def print_success(message: str):
         """Print a success message"""
-        console.print(f"[bold green]✅ {message}[/bold green]")
-    
+        _print_status("\x1b[1;32m", "bold green", "✅ ", message)
+
     @staticmethod
     def print_error(message: str):
         """Print an error message"""
-        console.print(f"[bold red]❌ {message}[/bold red]")
-    
+        _print_status("\x1b[1;31m", "bold red", "❌ ", message)
+
     @staticmethod
     def print_warning(message: str):
         """Print a warning message"""
-        console.print(f"[bold yellow]⚠️  {message}[/bold yellow]")
-    
+        _print_status("\x1b[1;33m", "bold yellow", "⚠️  ", message)
+
     @staticmethod
     def print_info(message: str):
         """Print an info message"""
-        console.print(f"[bold cyan]ℹ️  {message}[/bold cyan]")
+        _print_status("\x1b[1;36m", "bold cyan", "ℹ️  ", message)
     
     @staticmethod
     def print_goodbye():
         """Display goodbye message"""
-        goodbye_panel = Panel(
-            "[bold white]Thank you for using the Intelligent Query Router![/bold white]\n"
-            "[dim]Have a great day! 🌟[/dim]",
-            title="[bold cyan]👋 Goodbye[/bold cyan]",
-            border_style="cyan",
-            box=box.ROUNDED
-        )
-        console.print()
-        console.print(goodbye_panel)
-        console.print()
+        console.print(_GOODBYE_GROUP)
     
     @staticmethod
     def print_separator():
         """Print a visual separator"""
-        console.print("[dim]" + "─" * console.width + "[/dim]")
+        if _separator_cache:
+            console.print(_separator_cache[0])
+            return
+        line = "[dim]" + "─" * console.width + "[/dim]"
+        if _separator_cacheable:
+            _separator_cache.append(line)
+        console.print(line)
     
     @staticmethod
     def confirm_action(question: str) -> bool:
@@ -203,30 +283,20 @@ class UIComponents:
             console.print("[dim]No conversation history yet.[/dim]")
             return
         
-        console.print("\n[bold cyan]📜 Conversation History[/bold cyan]\n")
-        
+        renderables = ["\n[bold cyan]📜 Conversation History[/bold cyan]\n"]
+
         for i, message in enumerate(history, 1):
             role = message.get("role", "unknown")
             content = message.get("content", "")
-            
-            if role == "user":
-                icon = "👤"
-                color = "cyan"
-                title = "You"
-            elif role == "assistant":
-                icon = "🤖"
-                color = "green"
-                title = "AI"
-            else:
-                icon = "❓"
-                color = "yellow"
-                title = role.capitalize()
-            
-            panel = Panel(
+
+            icon, color, title = _ROLE_STYLES.get(role, ("❓", "yellow", role.capitalize()))
+
+            renderables.append(Panel(
                 content,
                 title=f"[bold {color}]{icon} {title}[/bold {color}]",
                 border_style=color,
                 box=box.ROUNDED
-            )
-            console.print(panel)
-            console.print()
+            ))
+            renderables.append("")
+
+        console.print(Group(*renderables))
@@ -1,42 +1,96 @@
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import time
 from typing import Optional
 from datetime import datetime
 
+# Listener thread that drains the log queue; kept so a repeat
+# setup_logging call can stop the previous one before starting anew
+_log_listener = None
+
+# The (log_level, log_file) pair of the active configuration; a repeat
+# setup_logging call with the same arguments returns without rebuilding
+# handlers or restarting the listener thread
+_current_config = None
+
+# Record layout never varies, so the formatter is built once here
+_formatter = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
 def setup_logging(log_level: str = "INFO", log_file: Optional[str] = None) -> None:
+    global _log_listener, _current_config
+
+    if _current_config == (log_level, log_file) and _log_listener is not None:
+        return
+
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
-    
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
+    formatter = _formatter
+
     root_logger = logging.getLogger()
     root_logger.setLevel(numeric_level)
-    
+
     root_logger.handlers.clear()
-    
+    _shutdown_logging()
+
+    # Real handlers live behind a queue: emitting a record from the main
+    # thread is just a queue put, and the listener thread below does the
+    # formatting and write syscalls off the hot path
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(numeric_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-    
+    handlers = [console_handler]
+
     if log_file:
         try:
             file_handler = logging.FileHandler(log_file)
             file_handler.setLevel(numeric_level)
             file_handler.setFormatter(formatter)
-            root_logger.addHandler(file_handler)
+            # Buffer file writes in memory and flush in batches; errors
+            # (and shutdown) flush immediately so nothing important waits
+            handlers.append(logging.handlers.MemoryHandler(
+                1024, flushLevel=logging.ERROR, target=file_handler
+            ))
         except Exception as e:
             print(f"Warning: Could not create log file {log_file}: {e}")
-    
+
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _log_listener.start()
+    _current_config = (log_level, log_file)
+    atexit.register(_shutdown_logging)
+
     logging.getLogger("urllib3").setLevel(logging.WARNING)  # Reduce noise from requests
     logging.getLogger("requests").setLevel(logging.WARNING)
 
-def display_banner() -> None:
-    banner = """
+def _shutdown_logging() -> None:
+    """Drain the queue and flush buffered records at interpreter exit."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        # stop() only joins the thread; the memory handler still holds
+        # buffered records until it is flushed/closed explicitly
+        for handler in _log_listener.handlers:
+            try:
+                handler.flush()
+                handler.close()
+            except Exception:
+                pass
+        _log_listener = None
+
+# Encoded once at import; display_banner then issues one buffered write
+# instead of the many small line-buffered writes print() can produce
+_BANNER_BYTES = """
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║                                                                              ║
 ║                    🤖 Intelligent Query Router 🤖                           ║
@@ -53,18 +107,22 @@ def display_banner() -> None:
 ║                                                                              ║                                   ║
 ║                                                                              ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
-    """
-    print(banner)
+    \n""".encode('utf-8')
+
+def display_banner() -> None:
+    sys.stdout.buffer.write(_BANNER_BYTES)
+    sys.stdout.flush()
+
+# Variables the application cannot run without
+_REQUIRED_ENV_VARS = ('OPENAI_API_KEY',)
 
 def validate_environment() -> bool:
 
-    required_vars = ['OPENAI_API_KEY']
-    missing_vars = []
-    
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
-    
+    # Bind os.environ once and use its .get directly; os.getenv is just a
+    # wrapper around it with an extra function call per variable
+    env = os.environ
+    missing_vars = [var for var in _REQUIRED_ENV_VARS if not env.get(var)]
+
     if missing_vars:
         print("❌ Missing required environment variables:")
         for var in missing_vars:
@@ -76,18 +134,36 @@ def validate_environment() -> bool:
     
     return True
 
+# Last formatted "now" second and its string; timestamps only change
+# once per second, so repeated calls within the same second reuse the
+# cached string instead of allocating a datetime and re-running strftime
+_LAST_TS = [0, ""]
+
 def format_timestamp(timestamp: Optional[datetime] = None) -> str:
 
     if timestamp is None:
-        timestamp = datetime.now()
-    
+        now = int(time.time())
+        if now == _LAST_TS[0]:
+            return _LAST_TS[1]
+        formatted = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        _LAST_TS[0] = now
+        _LAST_TS[1] = formatted
+        return formatted
+
     return timestamp.strftime("%Y-%m-%d %H:%M:%S")
 
-def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
+# Default truncation suffix; the identity check in truncate_text lets the
+# common no-argument case skip the len(suffix) arithmetic
+_DEFAULT_SUFFIX = "..."
+
+def truncate_text(text: str, max_length: int = 100, suffix: str = _DEFAULT_SUFFIX) -> str:
 
     if len(text) <= max_length:
         return text
-    
+
+    if suffix is _DEFAULT_SUFFIX:
+        return text[:max_length - 3] + "..."
+
     return text[:max_length - len(suffix)] + suffix
 
 def print_separator(char: str = "=", length: int = 60) -> None: